@@ -1,5 +1,4 @@
 from datetime import datetime, timedelta
-from jose import JWTError, jwt
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
@@ -11,6 +10,8 @@ security = HTTPBearer()
 
 
 def create_access_token(data: dict):
+    from jose import jwt  # lazy: keeps app import cheap
+
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
@@ -18,6 +19,8 @@ def create_access_token(data: dict):
 
 
 def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    from jose import JWTError, jwt  # lazy: keeps app import cheap
+
     token = credentials.credentials
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
@@ -28,4 +31,4 @@ def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token"
-        )
\ No newline at end of file
+        )
@@ -4,4 +4,31 @@ from dotenv import load_dotenv
 load_dotenv()  # loads .env from project root
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
-OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4.1")
\ No newline at end of file
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4.1")
+
+# Analysis preprocessing (see app/services/text_normalizer.py)
+# Hard cap on what reaches the LLM; never unlimited, so clamped to >= 1
+ANALYSIS_TOKEN_BUDGET = max(1, int(os.getenv("ANALYSIS_TOKEN_BUDGET", "5000")))
+# A line is boilerplate if it repeats on at least this share of pages
+BOILERPLATE_MIN_PAGE_RATIO = float(os.getenv("BOILERPLATE_MIN_PAGE_RATIO", "0.5"))
+
+# Startup
+QUEUE_REBUILD_BATCH_SIZE = int(os.getenv("QUEUE_REBUILD_BATCH_SIZE", "500"))
+
+# Storage lifecycle (see app/workers/lifecycle_worker.py)
+LIFECYCLE_ENABLED = os.getenv("LIFECYCLE_ENABLED", "1") == "1"
+LIFECYCLE_INTERVAL_SEC = float(os.getenv("LIFECYCLE_INTERVAL_SEC", "300"))
+LIFECYCLE_BATCH_SIZE = int(os.getenv("LIFECYCLE_BATCH_SIZE", "100"))
+LIFECYCLE_BATCH_PAUSE_SEC = float(os.getenv("LIFECYCLE_BATCH_PAUSE_SEC", "0.05"))
+# What to do with the original upload once text is extracted: keep | compress | delete
+UPLOAD_POLICY_AFTER_EXTRACTION = os.getenv("UPLOAD_POLICY_AFTER_EXTRACTION", "keep")
+# Expire documents older than N days by final status (0 = keep forever)
+RETAIN_COMPLETED_DAYS = int(os.getenv("RETAIN_COMPLETED_DAYS", "0"))
+RETAIN_FAILED_DAYS = int(os.getenv("RETAIN_FAILED_DAYS", "0"))
+# Max free pages returned to the OS per run (PRAGMA incremental_vacuum)
+VACUUM_PAGES_PER_RUN = int(os.getenv("VACUUM_PAGES_PER_RUN", "1000"))
+
+# Per-document tracing (see app/tracing/tracer.py)
+TRACE_ENABLED = os.getenv("TRACE_ENABLED", "1") == "1"
+# Optional OTLP/JSON export: one ExportTraceServiceRequest per line
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH", "")
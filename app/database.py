@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 DATABASE_URL = "sqlite:///./documents.db"
@@ -19,4 +19,56 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def init_db() -> None:
+    """
+    Explicit schema step (run once per deploy, not on every process start):
+    - create missing tables
+    - add columns (and their indexes) introduced after a table was first
+      created (SQLite only supports ADD COLUMN, which is all we need)
+    - switch SQLite to incremental auto_vacuum (one-off full VACUUM)
+
+    Usage: python -m app.database
+    """
+    # Register every model on Base.metadata
+    import app.models.document  # noqa: F401
+    import app.models.trace_span  # noqa: F401
+
+    # auto_vacuum must be set before tables exist (or be followed by a full
+    # VACUUM) for PRAGMA incremental_vacuum to reclaim pages later on.
+    with engine.connect() as conn:
+        if conn.exec_driver_sql("PRAGMA auto_vacuum").scalar() != 2:
+            conn.exec_driver_sql("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.exec_driver_sql("VACUUM")
+            print("[migrate] enabled incremental auto_vacuum")
+
+    Base.metadata.create_all(bind=engine)
+
+    insp = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {c["name"] for c in insp.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                col_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(
+                    text(f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {col_type}')
+                )
+                print(f"[migrate] added column {table.name}.{column.name}")
+
+            indexes = {i["name"] for i in insp.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in indexes:
+                    index.create(conn)
+                    print(f"[migrate] added index {index.name}")
+
+
+if __name__ == "__main__":
+    # Run via the package module so models register on the same Base
+    from app.database import init_db as _init_db
+
+    _init_db()
+    print("[migrate] schema up to date")
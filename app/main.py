@@ -1,8 +1,7 @@
 from fastapi import FastAPI, Depends
 from threading import Thread
 
-from app.database import Base, engine, SessionLocal
-from app.models.document import Document
+from app.database import SessionLocal
 
 from app.routes.auth import router as auth_router
 from app.routes.documents import router as document_router
@@ -12,33 +11,53 @@ from app.services.queue_bootstrap import rebuild_queue_from_db
 from app.queue.fifo_queue import document_queue
 
 from app.workers.document_worker import worker_loop  # NEW
+from app.workers.lifecycle_worker import lifecycle_loop
+from app.services.text_normalizer import preload_encoder
+from app.config import LIFECYCLE_ENABLED
 
 from app.routes.stream import router as stream_router
+from app.routes.admin import router as admin_router
 
 app = FastAPI(title="Document Intelligence API")
 
-Base.metadata.create_all(bind=engine)
+# Schema creation/migration is an explicit deploy step: python -m app.database
 
 app.include_router(auth_router)
 app.include_router(stream_router)     # ✅ register /documents/stream first
 app.include_router(document_router)   # ✅ register /documents/{document_id} after
+app.include_router(admin_router)
 
-@app.on_event("startup")
-def on_startup():
-    # Rebuild queue (restart-safe)
-    db = SessionLocal()
+
+def _rebuild_queue_in_background():
     try:
-        requeued = rebuild_queue_from_db(db)
-        print(f"[startup] Rebuilt queue. Requeued pending docs: {requeued}")
-        print(f"[startup] Queue snapshot: {document_queue.snapshot()}")
+        requeued = rebuild_queue_from_db(SessionLocal)
     finally:
-        db.close()
+        # Uploads received during the rebuild go behind the older pending docs
+        document_queue.end_restore()
+    print(f"[startup] Rebuilt queue. Requeued pending docs: {requeued}")
+    print(f"[startup] Queue size: {document_queue.size()}")
+
+
+@app.on_event("startup")
+def on_startup():
+    # Rebuild queue (restart-safe) without blocking the first request
+    document_queue.begin_restore()
+    Thread(target=_rebuild_queue_in_background, name="queue-rebuild", daemon=True).start()
+    print("[startup] Queue rebuild started")
+
+    # Tokenizer may need a download; load it off the worker thread
+    preload_encoder()
 
     # Start worker in background thread (non-blocking)
-    t = Thread(target=worker_loop, args=(SessionLocal,), daemon=True)
+    t = Thread(target=worker_loop, args=(SessionLocal,), name="document-worker", daemon=True)
     t.start()
     print("[startup] Worker thread started")
 
+    # Retention / compaction runs in its own thread, in bounded batches
+    if LIFECYCLE_ENABLED:
+        Thread(target=lifecycle_loop, args=(SessionLocal,), name="lifecycle", daemon=True).start()
+        print("[startup] Lifecycle thread started")
+
 
 @app.get("/")
 def root(payload: dict = Depends(verify_token)):
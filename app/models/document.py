@@ -13,14 +13,23 @@ class Document(Base):
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     filename = Column(String, nullable=False)
 
+    # Set for documents ingested together from one archive upload
+    batch_id = Column(String, nullable=True, index=True)
+
     current_status = Column(String, nullable=False, default="pending")
 
     # ✅ IMPORTANT: this makes SQLAlchemy detect JSON list changes and persist them
     status_history = Column(MutableList.as_mutable(JSON), nullable=False, default=list)
 
     extracted_text = Column(Text, nullable=True)
+    # Boilerplate/token-budget stats for the text actually sent to the LLM
+    preprocess_stats = Column(JSON, nullable=True)
     analysis_result = Column(JSON, nullable=True)
     error_message = Column(Text, nullable=True)
 
+    # Original upload on disk: None (as uploaded) | "compressed" | "deleted"
+    # | "error" (compaction failed, original kept)
+    upload_state = Column(String, nullable=True)
+
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
\ No newline at end of file
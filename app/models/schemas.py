@@ -19,10 +19,38 @@ class DocumentDetail(BaseModel):
     current_status: str
     status_history: List[StatusEvent]
     extracted_text: Optional[str] = None
+    preprocess_stats: Optional[Dict[str, Any]] = None
     analysis_result: Optional[Dict[str, Any]] = None
     error_message: Optional[str] = None
+    batch_id: Optional[str] = None
 
 
 class DocumentStatusOnly(BaseModel):
     document_id: str
-    current_status: str
\ No newline at end of file
+    current_status: str
+
+
+class BatchProgress(BaseModel):
+    batch_id: str
+    total: int
+    status_counts: Dict[str, int]
+    finished: int
+    done: bool
+
+
+class TraceSpanOut(BaseModel):
+    span_id: str
+    parent_span_id: Optional[str] = None
+    name: str
+    start: str
+    offset_ms: float
+    duration_ms: float
+    status: str
+    attributes: Dict[str, Any] = {}
+
+
+class DocumentTrace(BaseModel):
+    document_id: str
+    trace_id: Optional[str] = None
+    total_ms: float
+    spans: List[TraceSpanOut]
@@ -0,0 +1,22 @@
+from sqlalchemy import BigInteger, Column, Float, Integer, String
+from sqlalchemy.types import JSON
+
+from app.database import Base
+
+
+class TraceSpan(Base):
+    __tablename__ = "trace_spans"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    document_id = Column(String, nullable=False, index=True)
+
+    # OTLP-style ids (hex): trace = document, span = one timed step
+    trace_id = Column(String, nullable=False)
+    span_id = Column(String, nullable=False)
+    parent_span_id = Column(String, nullable=True)
+
+    name = Column(String, nullable=False)
+    start_ns = Column(BigInteger, nullable=False)  # unix epoch nanoseconds
+    duration_ms = Column(Float, nullable=False)
+    status = Column(String, nullable=False, default="ok")  # ok | error
+    attributes = Column(JSON, nullable=True)
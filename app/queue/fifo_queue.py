@@ -9,21 +9,56 @@ class FIFOQueue:
     - strict order (deque)
     - no duplicates (set)
     - thread-safe operations (Lock)
+    - restore mode: while pending ids from the DB are being re-queued,
+      new ids are held back and appended after them, so the order stays
+      strict across a restart
     """
 
     def __init__(self) -> None:
         self._q: Deque[str] = deque()
+        self._held: Deque[str] = deque()
         self._seen: Set[str] = set()
+        self._restoring = False
         self._lock = Lock()
 
+    def _add(self, document_id: str, target: Deque[str]) -> bool:
+        # Caller holds the lock
+        if document_id in self._seen:
+            return False
+        target.append(document_id)
+        self._seen.add(document_id)
+        return True
+
     def enqueue(self, document_id: str) -> bool:
         """Returns True if added, False if already queued."""
         with self._lock:
-            if document_id in self._seen:
-                return False
-            self._q.append(document_id)
-            self._seen.add(document_id)
-            return True
+            return self._add(document_id, self._held if self._restoring else self._q)
+
+    def enqueue_many(self, document_ids: List[str]) -> int:
+        """Adds ids in order under a single lock. Returns how many were added."""
+        with self._lock:
+            target = self._held if self._restoring else self._q
+            return sum(self._add(document_id, target) for document_id in document_ids)
+
+    def begin_restore(self) -> None:
+        """Holds back new ids until end_restore()."""
+        with self._lock:
+            self._restoring = True
+
+    def restore_many(self, document_ids: List[str]) -> int:
+        """
+        Adds ids recovered from the DB (oldest first) ahead of any held ids.
+        Returns how many were added.
+        """
+        with self._lock:
+            return sum(self._add(document_id, self._q) for document_id in document_ids)
+
+    def end_restore(self) -> None:
+        """Appends the held ids behind the restored ones."""
+        with self._lock:
+            self._q.extend(self._held)
+            self._held.clear()
+            self._restoring = False
 
     def dequeue(self) -> Optional[str]:
         """Returns next document_id or None if empty."""
@@ -35,13 +70,13 @@ class FIFOQueue:
             return doc_id
 
     def snapshot(self) -> List[str]:
-        """For debugging/verification."""
+        """For debugging/verification (held ids last, in serving order)."""
         with self._lock:
-            return list(self._q)
+            return list(self._q) + list(self._held)
 
     def size(self) -> int:
         with self._lock:
-            return len(self._q)
+            return len(self._q) + len(self._held)
 
 
 # Global singleton queue instance used by routes/workers
@@ -0,0 +1,49 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.auth.jwt_handler import verify_token
+from app.database import SessionLocal
+from app.tracing.profiler import MAX_PROFILE_SECONDS, ProfilerBusy, sample_threads
+from app.workers.lifecycle_worker import LifecycleBusy, run_lifecycle_once, storage_report
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+
+@router.get("/storage")
+def get_storage(user: dict = Depends(verify_token)):
+    """Disk usage (uploads + SQLite) and reclaimed-bytes counters."""
+    return storage_report()
+
+
+@router.post("/storage/lifecycle")
+def trigger_lifecycle(user: dict = Depends(verify_token)):
+    """Run one lifecycle pass now (same policies as the background loop)."""
+    try:
+        result = run_lifecycle_once(SessionLocal)
+    except LifecycleBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"result": result, "storage": storage_report()}
+
+
+@router.post("/profile")
+def capture_profile(
+    seconds: float = Query(default=5.0, gt=0, le=MAX_PROFILE_SECONDS),
+    interval_ms: float = Query(default=10.0, ge=1.0),
+    thread: Optional[str] = Query(default="document-worker", description="Thread name; empty = all threads"),
+    top: int = Query(default=25, ge=1, le=200),
+    user: dict = Depends(verify_token),
+):
+    """
+    Time-boxed sampling profile of background threads (default: the document worker).
+    Blocks for `seconds`; returns hot frames and flamegraph-ready folded stacks.
+    """
+    try:
+        return sample_threads(
+            seconds=seconds,
+            interval_ms=interval_ms,
+            thread_names=[thread] if thread else None,
+            top=top,
+        )
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
@@ -5,17 +5,34 @@ from datetime import datetime
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.auth.jwt_handler import verify_token
 from app.database import SessionLocal
 from app.models.document import Document
-from app.models.schemas import DocumentDetail, DocumentListItem, DocumentStatusOnly
+from app.models.trace_span import TraceSpan
+from app.models.schemas import (
+    BatchProgress,
+    DocumentDetail,
+    DocumentListItem,
+    DocumentStatusOnly,
+    DocumentTrace,
+    TraceSpanOut,
+)
 from app.queue.fifo_queue import document_queue
+from app.services.archive_ingest import (
+    MemberCorrupt,
+    MemberTooLarge,
+    copy_member,
+    iter_archive_members,
+)
+from app.tracing.tracer import tracer
 
 UPLOAD_DIR = "uploads"
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
 ALLOWED_EXT = {".pdf", ".txt"}
+FINAL_STATUSES = {"completed", "failed"}
 
 router = APIRouter(prefix="/documents", tags=["Documents"])
 
@@ -84,7 +101,8 @@ def upload_documents(
         db.add(doc)
         db.commit()
 
-        # FIFO enqueue
+        # FIFO enqueue (trace first: the worker may pick it up immediately)
+        tracer.record_enqueue([document_id])
         document_queue.enqueue(document_id)
 
         uploaded.append(
@@ -98,6 +116,119 @@ def upload_documents(
     return {"uploaded_documents": uploaded}
 
 
+@router.post("/upload/archive")
+def upload_archive(
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    user: dict = Depends(verify_token),
+):
+    """
+    Bulk ingestion: one ZIP or tar(.gz) upload fanned out into documents.
+    Members are streamed to disk one at a time; ALLOWED_EXT / MAX_FILE_SIZE
+    apply per member. Rejected members are reported, not fatal.
+    All Document rows are inserted in one commit and enqueued in one batch.
+    """
+    batch_id = str(uuid.uuid4())
+    docs: List[Document] = []
+    # Kept separately: reading d.id after commit would reload each expired row
+    document_ids: List[str] = []
+    skipped = []
+    created_dirs = []
+
+    try:
+        for member_name, declared_size, stream in iter_archive_members(file.file):
+            filename = os.path.basename(member_name)
+            ext = os.path.splitext(filename)[1].lower()
+            if not filename or ext not in ALLOWED_EXT:
+                skipped.append({"filename": member_name, "reason": "Invalid file type. Allowed: pdf, txt"})
+                continue
+            if declared_size is not None and declared_size > MAX_FILE_SIZE:
+                skipped.append({"filename": member_name, "reason": "File too large. Max 10MB per file."})
+                continue
+
+            document_id = str(uuid.uuid4())
+            doc_dir = os.path.join(UPLOAD_DIR, document_id)
+            os.makedirs(doc_dir, exist_ok=True)
+            created_dirs.append(doc_dir)
+
+            try:
+                copy_member(stream, os.path.join(doc_dir, filename), MAX_FILE_SIZE)
+            except MemberTooLarge:
+                shutil.rmtree(doc_dir, ignore_errors=True)
+                created_dirs.pop()
+                skipped.append({"filename": member_name, "reason": "File too large. Max 10MB per file."})
+                continue
+            except MemberCorrupt as e:
+                shutil.rmtree(doc_dir, ignore_errors=True)
+                created_dirs.pop()
+                skipped.append({"filename": member_name, "reason": f"Unreadable member: {e}"})
+                continue
+
+            doc = Document(
+                id=document_id,
+                filename=filename,
+                batch_id=batch_id,
+                current_status="pending",
+                status_history=[],
+            )
+            _append_status(doc, "pending")
+            docs.append(doc)
+            document_ids.append(document_id)
+
+        if not docs:
+            raise HTTPException(status_code=400, detail="Archive contains no valid documents")
+
+        db.add_all(docs)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        for doc_dir in created_dirs:
+            shutil.rmtree(doc_dir, ignore_errors=True)
+        if isinstance(e, HTTPException):
+            raise
+        if isinstance(e, ValueError):
+            raise HTTPException(status_code=400, detail=str(e))
+        raise HTTPException(status_code=400, detail=f"Archive error: {str(e)}")
+
+    # FIFO enqueue, archive order preserved (trace first, as above)
+    tracer.record_enqueue(document_ids)
+    document_queue.enqueue_many(document_ids)
+
+    return {
+        "batch_id": batch_id,
+        "accepted": len(document_ids),
+        "skipped": skipped,
+    }
+
+
+@router.get("/batches/{batch_id}", response_model=BatchProgress)
+def get_batch_progress(
+    batch_id: str,
+    db: Session = Depends(get_db),
+    user: dict = Depends(verify_token),
+):
+    rows = (
+        db.query(Document.current_status, func.count(Document.id))
+        .filter(Document.batch_id == batch_id)
+        .group_by(Document.current_status)
+        .all()
+    )
+    if not rows:
+        raise HTTPException(status_code=404, detail="Batch not found")
+
+    status_counts = {status: count for status, count in rows}
+    total = sum(status_counts.values())
+    finished = sum(c for s, c in status_counts.items() if s in FINAL_STATUSES)
+
+    return BatchProgress(
+        batch_id=batch_id,
+        total=total,
+        status_counts=status_counts,
+        finished=finished,
+        done=finished == total,
+    )
+
+
 @router.get("", response_model=List[DocumentListItem])
 def list_documents(
     status: Optional[str] = Query(default=None, description="Filter by current_status"),
@@ -136,8 +267,10 @@ def get_document_detail(
         current_status=d.current_status,
         status_history=d.status_history or [],
         extracted_text=d.extracted_text,
+        preprocess_stats=d.preprocess_stats,
         analysis_result=d.analysis_result,
         error_message=d.error_message,
+        batch_id=d.batch_id,
     )
 
 
@@ -154,6 +287,48 @@ def get_document_status(
     return DocumentStatusOnly(document_id=d.id, current_status=d.current_status)
 
 
+@router.get("/{document_id}/trace", response_model=DocumentTrace)
+def get_document_trace(
+    document_id: str,
+    db: Session = Depends(get_db),
+    user: dict = Depends(verify_token),
+):
+    d = db.query(Document).filter(Document.id == document_id).first()
+    if not d:
+        raise HTTPException(status_code=404, detail="Document not found")
+
+    spans = (
+        db.query(TraceSpan)
+        .filter(TraceSpan.document_id == document_id)
+        .order_by(TraceSpan.start_ns, TraceSpan.id)
+        .all()
+    )
+    if not spans:
+        return DocumentTrace(document_id=document_id, total_ms=0.0, spans=[])
+
+    t0 = spans[0].start_ns
+    end = max(s.start_ns + int(s.duration_ms * 1e6) for s in spans)
+
+    return DocumentTrace(
+        document_id=document_id,
+        trace_id=spans[0].trace_id,
+        total_ms=(end - t0) / 1e6,
+        spans=[
+            TraceSpanOut(
+                span_id=s.span_id,
+                parent_span_id=s.parent_span_id,
+                name=s.name,
+                start=datetime.utcfromtimestamp(s.start_ns / 1e9).isoformat(),
+                offset_ms=(s.start_ns - t0) / 1e6,
+                duration_ms=s.duration_ms,
+                status=s.status,
+                attributes=s.attributes or {},
+            )
+            for s in spans
+        ],
+    )
+
+
 @router.delete("/{document_id}")
 def delete_document(
     document_id: str,
@@ -171,6 +346,7 @@ def delete_document(
             detail="Cannot delete document while processing",
         )
 
+    db.query(TraceSpan).filter(TraceSpan.document_id == document_id).delete()
     db.delete(d)
     db.commit()
 
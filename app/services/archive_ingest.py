@@ -0,0 +1,102 @@
+import os
+import tarfile
+import zipfile
+import zlib
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+CHUNK_SIZE = 1024 * 1024  # 1MB
+
+
+# Raised while opening/reading a single broken member (bad CRC, bad
+# deflate stream, encrypted entry, unsupported compression, truncation)
+MEMBER_READ_ERRORS = (zipfile.BadZipFile, zlib.error, RuntimeError, NotImplementedError, EOFError)
+
+
+class MemberTooLarge(Exception):
+    pass
+
+
+class MemberCorrupt(Exception):
+    pass
+
+
+class _UnreadableMember:
+    """Stands in for a member whose stream could not be opened."""
+
+    def __init__(self, error: Exception) -> None:
+        self.error = error
+
+    def read(self, size: int = -1) -> bytes:
+        raise MemberCorrupt(str(self.error))
+
+
+def iter_archive_members(fileobj: BinaryIO) -> Iterator[Tuple[str, Optional[int], BinaryIO]]:
+    """
+    Yields (member_name, declared_size, stream) for each regular file in a
+    ZIP or tar(.gz/.bz2/.xz) archive, one member at a time.
+
+    - ZIP: read through the central directory; members are decompressed lazily.
+    - tar: opened in stream mode ("r|*"), so the archive is read sequentially
+      and never extracted as a whole. Each stream must be consumed before
+      advancing to the next member.
+
+    Raises ValueError if the upload is neither a ZIP nor a tar archive.
+    """
+    fileobj.seek(0)
+    if zipfile.is_zipfile(fileobj):
+        fileobj.seek(0)
+        with zipfile.ZipFile(fileobj) as zf:
+            for info in zf.infolist():
+                if info.is_dir():
+                    continue
+                try:
+                    stream = zf.open(info)
+                except MEMBER_READ_ERRORS as e:
+                    # Reported per member by copy_member, not fatal
+                    yield info.filename, info.file_size, _UnreadableMember(e)
+                    continue
+                with stream:
+                    yield info.filename, info.file_size, stream
+        return
+
+    fileobj.seek(0)
+    try:
+        tf = tarfile.open(fileobj=fileobj, mode="r|*")
+    except tarfile.TarError:
+        raise ValueError("Unsupported archive: expected ZIP or tar(.gz)")
+
+    with tf:
+        for member in tf:
+            if not member.isfile():
+                continue
+            stream = tf.extractfile(member)
+            if stream is None:
+                continue
+            yield member.name, member.size, stream
+
+
+def copy_member(stream: BinaryIO, dest_path: str, max_size: int) -> int:
+    """
+    Streams a member to disk in chunks.
+    Enforces max_size on the bytes actually read (declared sizes can lie).
+    Returns bytes written. Raises MemberTooLarge, or MemberCorrupt if the
+    member cannot be read; the partial file is removed in both cases.
+    """
+    written = 0
+    try:
+        with open(dest_path, "wb") as out:
+            while True:
+                try:
+                    chunk = stream.read(CHUNK_SIZE)
+                except MEMBER_READ_ERRORS as e:
+                    raise MemberCorrupt(str(e))
+                if not chunk:
+                    break
+                written += len(chunk)
+                if written > max_size:
+                    raise MemberTooLarge(dest_path)
+                out.write(chunk)
+    except (MemberTooLarge, MemberCorrupt):
+        os.remove(dest_path)
+        raise
+    return written
@@ -1,11 +1,28 @@
 import json
 import time
+from threading import Lock
 from typing import Tuple, Dict, Any
 
-from openai import OpenAI
 from app.config import OPENAI_API_KEY, OPENAI_MODEL
+from app.tracing.tracer import tracer
 
-client = OpenAI(api_key=OPENAI_API_KEY)
+_client = None
+_client_lock = Lock()
+
+
+def get_client():
+    """
+    Build the OpenAI client on first use.
+    Importing `openai` is slow, so it is deferred until a document is analyzed.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from openai import OpenAI
+
+                _client = OpenAI(api_key=OPENAI_API_KEY)
+    return _client
 
 
 SYSTEM_PROMPT = """
@@ -28,15 +45,19 @@ Rules:
 
 
 def analyze_text_once(text: str) -> Tuple[bool, Dict[str, Any] | str]:
+    """
+    `text` should already be cut to the token budget by
+    text_normalizer.normalize_for_analysis.
+    """
     if not OPENAI_API_KEY:
         return False, "OPENAI_API_KEY is not set"
 
     try:
-        resp = client.chat.completions.create(
+        resp = get_client().chat.completions.create(
             model=OPENAI_MODEL,
             messages=[
                 {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": f"Document text:\n\n{text[:20000]}"},
+                {"role": "user", "content": f"Document text:\n\n{text}"},
             ],
             temperature=0.2,
         )
@@ -62,15 +83,23 @@ def analyze_text_once(text: str) -> Tuple[bool, Dict[str, Any] | str]:
         return False, f"LLM error: {str(e)}"
 
 
+def _traced_attempt(text: str, attempt: int) -> Tuple[bool, Dict[str, Any] | str]:
+    with tracer.span("llm.attempt", attempt=attempt, model=OPENAI_MODEL) as span:
+        ok, result = analyze_text_once(text)
+        if not ok:
+            span["error"] = str(result)
+        return ok, result
+
+
 def analyze_with_retry(text: str, retry_delay_sec: float = 0.8) -> Tuple[bool, Dict[str, Any] | str]:
-    ok, result = analyze_text_once(text)
+    ok, result = _traced_attempt(text, 1)
     if ok:
         return True, result
 
     # Retry once
     time.sleep(retry_delay_sec)
-    ok2, result2 = analyze_text_once(text)
+    ok2, result2 = _traced_attempt(text, 2)
     if ok2:
         return True, result2
 
-    return False, result2
\ No newline at end of file
+    return False, result2
@@ -1,26 +1,56 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import asc
+from sqlalchemy import String, asc, and_, cast, or_
 
+from app.config import QUEUE_REBUILD_BATCH_SIZE
 from app.models.document import Document
 from app.queue.fifo_queue import document_queue
 
 
-def rebuild_queue_from_db(db: Session) -> int:
+def rebuild_queue_from_db(db_factory, batch_size: int = QUEUE_REBUILD_BATCH_SIZE) -> int:
     """
     On server startup, re-enqueue documents that are still pending.
     This makes the system survive restart even though the queue is in-memory.
+
+    Runs in a background thread: pending ids are streamed in keyset-paginated
+    batches (ordered by created_at, id), each batch in its own short-lived
+    session so the rebuild never holds a long read transaction and the
+    worker can start on the first batch straight away.
+
+    Ids are added with restore_many(): if the caller put the queue in
+    restore mode, uploads arriving meanwhile wait behind the rebuilt ids.
     """
-    pending_docs = (
-        db.query(Document)
-        .filter(Document.current_status == "pending")
-        .order_by(asc(Document.created_at))
-        .all()
-    )
+    # Compare the stored value as text: SQLite keeps server_default timestamps
+    # as "YYYY-MM-DD HH:MM:SS", which would not equal a re-bound datetime param.
+    created_key = cast(Document.created_at, String)
 
     count = 0
-    for doc in pending_docs:
-        added = document_queue.enqueue(doc.id)
-        if added:
-            count += 1
+    last_created_at = None
+    last_id = None
+
+    while True:
+        db = db_factory()
+        try:
+            q = db.query(Document.id, created_key).filter(
+                Document.current_status == "pending"
+            )
+            if last_created_at is not None:
+                q = q.filter(
+                    or_(
+                        created_key > last_created_at,
+                        and_(created_key == last_created_at, Document.id > last_id),
+                    )
+                )
+            rows = (
+                q.order_by(asc(created_key), asc(Document.id))
+                .limit(batch_size)
+                .all()
+            )
+        finally:
+            db.close()
+
+        count += document_queue.restore_many([doc_id for doc_id, _ in rows])
+
+        if len(rows) < batch_size:
+            break
+        last_id, last_created_at = rows[-1][0], rows[-1][1]
 
-    return count
\ No newline at end of file
+    return count
@@ -1,9 +1,11 @@
 import os
-from typing import Tuple
-from pypdf import PdfReader
+from typing import List, Tuple
+
+from app.tracing.tracer import tracer
 
 
 ALLOWED_EXTENSIONS = {".pdf", ".txt"}
+PDF_TRACE_PAGE_BATCH = 10
 
 
 def extract_text_from_txt(path: str) -> str:
@@ -17,41 +19,53 @@ def extract_text_from_txt(path: str) -> str:
         return raw.decode("latin-1", errors="ignore")
 
 
-def extract_text_from_pdf(path: str) -> str:
+def extract_pages_from_pdf(path: str) -> List[str]:
+    from pypdf import PdfReader  # lazy: only needed for PDFs
+
     reader = PdfReader(path)
     parts = []
+    total = len(reader.pages)
 
-    for page in reader.pages:
-        txt = page.extract_text() or ""
-        parts.append(txt)
+    # Traced in batches so one pathological page shows up in the timeline
+    for first in range(0, total, PDF_TRACE_PAGE_BATCH):
+        last = min(first + PDF_TRACE_PAGE_BATCH, total)
+        with tracer.span("extract.pages", first_page=first + 1, last_page=last) as span:
+            chars = 0
+            for i in range(first, last):
+                txt = reader.pages[i].extract_text() or ""
+                chars += len(txt)
+                parts.append(txt)
+            span["chars"] = chars
 
-    text = "\n".join(parts).strip()
-    return text
+    return parts
 
 
-def extract_text(file_path: str) -> Tuple[bool, str]:
+def extract_text(file_path: str) -> Tuple[bool, str, List[str]]:
     """
-    Returns (success, text_or_error)
+    Returns (success, text_or_error, pages)
+    pages: text of each PDF page ([text] for .txt, [] on failure); the
+    normalizer uses them to find repeated headers/footers
     """
     if not os.path.exists(file_path):
-        return False, f"File not found on disk: {file_path}"
+        return False, f"File not found on disk: {file_path}", []
 
     _, ext = os.path.splitext(file_path)
     ext = ext.lower()
 
     if ext not in ALLOWED_EXTENSIONS:
-        return False, f"Unsupported file type for extraction: {ext}"
+        return False, f"Unsupported file type for extraction: {ext}", []
 
     try:
         if ext == ".txt":
-            text = extract_text_from_txt(file_path)
+            pages = [extract_text_from_txt(file_path)]
         else:
-            text = extract_text_from_pdf(file_path)
+            pages = extract_pages_from_pdf(file_path)
 
-        if not text.strip():
-            return False, "No text could be extracted (empty result)"
+        text = "\n".join(pages).strip()
+        if not text:
+            return False, "No text could be extracted (empty result)", []
 
-        return True, text
+        return True, text, pages
 
     except Exception as e:
-        return False, f"Extraction error: {str(e)}"
\ No newline at end of file
+        return False, f"Extraction error: {str(e)}", []
\ No newline at end of file
@@ -0,0 +1,257 @@
+import re
+from collections import Counter
+from threading import Lock, Thread
+from typing import Any, Dict, List, Set, Tuple
+
+from app.config import ANALYSIS_TOKEN_BUDGET, BOILERPLATE_MIN_PAGE_RATIO, OPENAI_MODEL
+
+# Pages needed before "repeated on most pages" means anything
+MIN_PAGES_FOR_BOILERPLATE = 3
+# Lines at the top/bottom of a page checked as running headers/footers
+EDGE_LINES = 2
+# Away from the page edges only long repeated lines (legal notices) are
+# boilerplate; short repeated lines there are labels ("Revenue", "Total")
+MIN_BOILERPLATE_WORDS = 8
+
+_DIGITS = re.compile(r"\d+")
+_WORD = re.compile(r"[a-z]{2,}")
+# "Page 3", "p. 3", "Page 3 of 12", "3 of 12", "3/12", "- 3 -"
+_PAGE_NUMBER_LINE = re.compile(
+    r"^(?:(?:page|p\.|pg\.?)\s*\d+(?:\s*(?:of|/)\s*\d+)?"
+    r"|\d+\s*(?:of|/)\s*\d+"
+    r"|[-\u2013\u2014]\s*\d+\s*[-\u2013\u2014])$",
+    re.IGNORECASE,
+)
+_HYPHEN_BREAK = re.compile(r"(\w)-\n\s*(\w)")
+_INLINE_SPACE = re.compile(r"[ \t\u00a0]+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+# Rough cl100k/o200k-style token: a word/number piece of up to 4 chars,
+# or one punctuation char. Each match is one approximate token.
+_APPROX_TOKEN = re.compile(r"\w{1,4}|[^\w\s]")
+
+_encoder = None
+_encoder_state = "idle"  # idle | loading | ready | failed
+_encoder_lock = Lock()
+
+
+def _load_encoder() -> None:
+    global _encoder, _encoder_state
+    try:
+        import tiktoken
+
+        try:
+            encoder = tiktoken.encoding_for_model(OPENAI_MODEL)
+        except KeyError:
+            encoder = tiktoken.get_encoding("o200k_base")
+        _encoder = encoder
+        _encoder_state = "ready"
+        print(f"[normalizer] tiktoken encoder loaded: {encoder.name}")
+    except Exception as e:
+        _encoder_state = "failed"
+        print(f"[normalizer] tiktoken unavailable, using approximation: {e}")
+
+
+def preload_encoder() -> None:
+    """
+    Loads the tiktoken encoder in a daemon thread (idempotent).
+    The first load downloads the BPE file unless TIKTOKEN_CACHE_DIR already
+    holds it, and that download has no timeout, so it must never run on
+    the worker thread.
+    """
+    global _encoder_state
+    with _encoder_lock:
+        if _encoder_state != "idle":
+            return
+        _encoder_state = "loading"
+    Thread(target=_load_encoder, name="tokenizer-preload", daemon=True).start()
+
+
+def _get_encoder():
+    """
+    Never blocks: the tiktoken encoder once loaded, otherwise None and the
+    caller falls back to the regex approximation.
+    """
+    if _encoder_state == "idle":
+        preload_encoder()
+    return _encoder
+
+
+def _count(text: str, enc) -> int:
+    if enc is not None:
+        return len(enc.encode(text, disallowed_special=()))
+    # Streamed: no per-token list for multi-MB documents
+    return sum(1 for _ in _APPROX_TOKEN.finditer(text))
+
+
+def _truncate(text: str, budget: int, enc) -> Tuple[str, int]:
+    if budget <= 0:
+        return "", 0
+
+    if enc is not None:
+        tokens = enc.encode(text, disallowed_special=())
+        if len(tokens) <= budget:
+            return text, len(tokens)
+        return enc.decode(tokens[:budget]), budget
+
+    # Walk only as far as the budget, then cut after the last token taken
+    count = 0
+    for m in _APPROX_TOKEN.finditer(text):
+        count += 1
+        if count == budget:
+            end = m.end()
+            if _APPROX_TOKEN.search(text, end) is None:
+                return text, count
+            return text[:end], budget
+    return text, count
+
+
+def count_tokens(text: str) -> int:
+    return _count(text, _get_encoder())
+
+
+def truncate_to_tokens(text: str, budget: int) -> Tuple[str, int]:
+    """Returns (text cut to at most `budget` tokens, token count of result)."""
+    return _truncate(text, budget, _get_encoder())
+
+
+def _exact_key(line: str) -> str:
+    return " ".join(line.split()).lower()
+
+
+def _edge_key(line: str) -> str:
+    # "Page 3 of 12" and "Page 4 of 12" are the same footer; but bare
+    # figures ("$1500", "42%") keep their digits or they would all collide
+    key = _exact_key(line)
+    if _WORD.search(key):
+        return _DIGITS.sub("#", key)
+    return key
+
+
+def _edge_indices(lines: List[str]) -> Set[int]:
+    """
+    Indices (into `lines`) of the first/last non-empty lines of a page.
+    Short pages: only the outermost quarter counts as header/footer.
+    """
+    non_empty = [i for i, line in enumerate(lines) if line.strip()]
+    n = min(EDGE_LINES, max(1, len(non_empty) // 4))
+    return set(non_empty[:n] + non_empty[-n:])
+
+
+def _is_long(line: str) -> bool:
+    return len(line.split()) >= MIN_BOILERPLATE_WORDS
+
+
+def _page_keys(lines: List[str]) -> Set[str]:
+    """
+    Keys used for repeat detection on one page:
+    - edge lines with digits masked (running headers and footers carry
+      page numbers, dates, section counters)
+    - long interior lines, exactly (legal boilerplate can sit anywhere)
+    """
+    edges = _edge_indices(lines)
+    keys = set()
+    for i, line in enumerate(lines):
+        if not line.strip():
+            continue
+        if i in edges:
+            keys.add("edge:" + _edge_key(line))
+        elif _is_long(line):
+            keys.add(_exact_key(line))
+    return keys
+
+
+def find_repeated_lines(pages: List[List[str]], min_ratio: float) -> Dict[str, int]:
+    """
+    Line keys appearing on at least min_ratio of pages.
+    Returns {line_key: number_of_pages_it_appears_on}.
+    """
+    if len(pages) < MIN_PAGES_FOR_BOILERPLATE:
+        return {}
+
+    page_freq: Counter = Counter()
+    for lines in pages:
+        page_freq.update(_page_keys(lines))
+
+    threshold = max(2, int(len(pages) * min_ratio + 0.999))
+    return {key: n for key, n in page_freq.items() if n >= threshold}
+
+
+def _clean_whitespace(text: str) -> str:
+    """Re-join hyphenated line breaks, collapse spaces and blank lines."""
+    text = _HYPHEN_BREAK.sub(r"\1\2", text)
+    text = _INLINE_SPACE.sub(" ", text)
+    text = "\n".join(line.strip() for line in text.split("\n"))
+    return _BLANK_LINES.sub("\n\n", text).strip()
+
+
+def normalize_for_analysis(
+    page_texts: List[str],
+    token_budget: int = ANALYSIS_TOKEN_BUDGET,
+    min_page_ratio: float = BOILERPLATE_MIN_PAGE_RATIO,
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Prepares extracted text for the LLM without touching the stored original:
+    1) drop headers/footers/boilerplate repeated across pages
+    2) drop page-number lines at page edges (multi-page documents only)
+    3) re-join hyphenated line breaks, collapse whitespace
+    4) cut to `token_budget` tokens
+
+    page_texts: one string per page, as returned by extract_text.
+    Returns (normalized_text, stats).
+    """
+    text = "\n".join(page_texts)
+    pages = [page.splitlines() for page in page_texts]
+    repeated = find_repeated_lines(pages, min_page_ratio)
+    multi_page = len(pages) > 1
+
+    kept_pages = []
+    removed_lines = 0
+    for lines in pages:
+        edges = _edge_indices(lines)
+        kept = []
+        for i, line in enumerate(lines):
+            stripped = line.strip()
+            if not stripped:
+                kept.append(line)
+                continue
+            if i in edges:
+                drop = "edge:" + _edge_key(stripped) in repeated or (
+                    multi_page and _PAGE_NUMBER_LINE.match(stripped)
+                )
+            else:
+                drop = _is_long(stripped) and _exact_key(stripped) in repeated
+            if drop:
+                removed_lines += 1
+                continue
+            kept.append(line)
+        kept_pages.append("\n".join(kept))
+
+    cleaned = _clean_whitespace("\n\n".join(kept_pages))
+    if not cleaned:
+        # Everything looked like boilerplate; analyze the whole text instead
+        cleaned = _clean_whitespace("\n\n".join(page_texts))
+
+    # One tokenizer for the whole document, even if tiktoken finishes loading midway
+    enc = _get_encoder()
+    tokens_before = _count(text, enc)
+    tokens_cleaned = _count(cleaned, enc)
+    normalized, tokens_after = _truncate(cleaned, token_budget, enc)
+
+    stats = {
+        "pages": len(pages),
+        "chars_before": len(text),
+        "chars_after": len(normalized),
+        "tokens_before": tokens_before,
+        "tokens_cleaned": tokens_cleaned,
+        "tokens_after": tokens_after,
+        "token_budget": token_budget,
+        "truncated": tokens_cleaned > token_budget,
+        "removed_lines": removed_lines,
+        # top repeated lines with the number of pages they appeared on
+        "repeated_lines": dict(
+            sorted(repeated.items(), key=lambda kv: kv[1], reverse=True)[:20]
+        ),
+        "reduction_ratio": round(1 - tokens_after / tokens_before, 4) if tokens_before else 0.0,
+        "tokenizer": "tiktoken" if enc is not None else "approx",
+    }
+    return normalized, stats
@@ -0,0 +1,204 @@
+import json
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import TRACE_ENABLED, TRACE_EXPORT_PATH
+from app.models.document import Document
+from app.models.trace_span import TraceSpan
+
+SERVICE_NAME = "document-intelligence"
+
+# (document_id, span_id) of the innermost open span on this thread
+_current: ContextVar[Optional[Tuple[str, str]]] = ContextVar("trace_current", default=None)
+
+
+def _trace_id(document_id: str) -> str:
+    # Document ids are uuid4, so the hex form is a valid 16-byte trace id
+    return document_id.replace("-", "")[:32].ljust(32, "0")
+
+
+def _new_span_id() -> str:
+    return os.urandom(8).hex()
+
+
+class Tracer:
+    """
+    Span-style per-document traces:
+    - spans are buffered in memory per document (thread-safe)
+    - flush() persists them to trace_spans in one commit and optionally
+      appends them to an OTLP/JSON file
+    - span() nests via a ContextVar, so deep code (pdf page loop, LLM
+      attempts) can open spans without the document id being passed down
+    """
+
+    def __init__(self, enabled: bool = TRACE_ENABLED, export_path: str = TRACE_EXPORT_PATH) -> None:
+        self.enabled = enabled
+        self.export_path = export_path
+        self._lock = Lock()
+        self._export_lock = Lock()
+        self._buffers: Dict[str, List[Dict[str, Any]]] = {}
+        self._enqueued_at: Dict[str, int] = {}
+
+    def _record(self, document_id: str, span: Dict[str, Any]) -> None:
+        with self._lock:
+            self._buffers.setdefault(document_id, []).append(span)
+
+    def record_enqueue(self, document_ids: Iterable[str]) -> None:
+        """Marks documents as enqueued now (start of queue wait)."""
+        if not self.enabled:
+            return
+        now = time.time_ns()
+        for document_id in document_ids:
+            with self._lock:
+                self._enqueued_at[document_id] = now
+            self._record(document_id, {
+                "span_id": _new_span_id(),
+                "parent_span_id": None,
+                "name": "enqueue",
+                "start_ns": now,
+                "duration_ms": 0.0,
+                "status": "ok",
+                "attributes": {},
+            })
+
+    @contextmanager
+    def span(self, name: str, document_id: Optional[str] = None, **attributes: Any) -> Iterator[Dict[str, Any]]:
+        """
+        Times the enclosed block as a span. Yields the attributes dict so the
+        caller can add to it; setting attributes["error"] marks the span failed.
+        No-op when tracing is disabled or there is no document in context.
+        """
+        parent = _current.get()
+        if document_id is None and parent is not None:
+            document_id = parent[0]
+        if not self.enabled or document_id is None:
+            yield attributes
+            return
+
+        span_id = _new_span_id()
+        parent_span_id = parent[1] if parent is not None and parent[0] == document_id else None
+        token = _current.set((document_id, span_id))
+        start_ns = time.time_ns()
+        start = time.perf_counter()
+        status = "ok"
+        try:
+            yield attributes
+        except Exception as e:
+            status = "error"
+            attributes.setdefault("error", str(e))
+            raise
+        finally:
+            _current.reset(token)
+            if attributes.get("error"):
+                status = "error"
+            self._record(document_id, {
+                "span_id": span_id,
+                "parent_span_id": parent_span_id,
+                "name": name,
+                "start_ns": start_ns,
+                "duration_ms": (time.perf_counter() - start) * 1000,
+                "status": status,
+                "attributes": attributes,
+            })
+
+    @contextmanager
+    def document(self, document_id: str) -> Iterator[Dict[str, Any]]:
+        """
+        Root span for one worker pass over a document. Records queue wait
+        (enqueue -> dequeue) when the enqueue time is known in this process.
+        """
+        with self._lock:
+            enqueued_at = self._enqueued_at.pop(document_id, None)
+        attributes: Dict[str, Any] = {}
+        if enqueued_at is not None:
+            attributes["queue_wait_ms"] = (time.time_ns() - enqueued_at) / 1e6
+        with self.span("process", document_id=document_id, **attributes) as attrs:
+            yield attrs
+
+    def discard(self, document_id: str) -> None:
+        """Drops everything buffered for a document without persisting it."""
+        with self._lock:
+            self._buffers.pop(document_id, None)
+            self._enqueued_at.pop(document_id, None)
+
+    def flush(self, db: Session, document_id: str) -> int:
+        """
+        Persists buffered spans for a document. Returns number written.
+        Spans of a document that no longer exists (deleted while pending)
+        are discarded, since nothing would ever clean them up.
+        """
+        with self._lock:
+            spans = self._buffers.pop(document_id, [])
+            self._enqueued_at.pop(document_id, None)
+        if not spans:
+            return 0
+
+        if db.query(Document.id).filter(Document.id == document_id).first() is None:
+            return 0
+
+        trace_id = _trace_id(document_id)
+        db.add_all(
+            TraceSpan(document_id=document_id, trace_id=trace_id, **span) for span in spans
+        )
+        db.commit()
+
+        if self.export_path:
+            self._export(trace_id, spans)
+        return len(spans)
+
+    def _export(self, trace_id: str, spans: List[Dict[str, Any]]) -> None:
+        line = json.dumps(to_otlp(trace_id, spans))
+        with self._export_lock:
+            with open(self.export_path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp(trace_id: str, spans: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Spans as an OTLP/JSON ExportTraceServiceRequest."""
+    otlp_spans = []
+    for span in spans:
+        end_ns = span["start_ns"] + int(span["duration_ms"] * 1e6)
+        otlp_span = {
+            "traceId": trace_id,
+            "spanId": span["span_id"],
+            "name": span["name"],
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(span["start_ns"]),
+            "endTimeUnixNano": str(end_ns),
+            "attributes": [
+                {"key": k, "value": _otlp_value(v)} for k, v in (span["attributes"] or {}).items()
+            ],
+            "status": {"code": 2 if span["status"] == "error" else 1},
+        }
+        if span["parent_span_id"]:
+            otlp_span["parentSpanId"] = span["parent_span_id"]
+        otlp_spans.append(otlp_span)
+
+    return {
+        "resourceSpans": [{
+            "resource": {
+                "attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]
+            },
+            "scopeSpans": [{"scope": {"name": "app.tracing"}, "spans": otlp_spans}],
+        }]
+    }
+
+
+# Global singleton tracer used by routes/workers/services
+tracer = Tracer()
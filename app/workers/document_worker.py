@@ -9,6 +9,8 @@ from app.queue.fifo_queue import document_queue
 from app.models.document import Document
 from app.services.text_extractor import extract_text
 from app.services.llm_analyzer import analyze_with_retry
+from app.services.text_normalizer import normalize_for_analysis
+from app.tracing.tracer import tracer
 
 UPLOAD_DIR = "uploads"
 
@@ -52,10 +54,15 @@ def publish_status_event(doc: Document):
     _safe_publish(event)
 
 
+def commit_traced(db: Session, step: str):
+    with tracer.span("db.commit", step=step):
+        db.commit()
+
+
 def mark_failed(db: Session, doc: Document, error_message: str):
     doc.error_message = error_message
     append_status(doc, "failed")
-    db.commit()
+    commit_traced(db, "failed")
     publish_status_event(doc)
     print(f"[worker] failed: {doc.id} reason={error_message}")
 
@@ -72,57 +79,84 @@ def worker_loop(db_factory, poll_interval: float = 0.5):
 
         db: Session = db_factory()
         try:
-            doc = db.query(Document).filter(Document.id == doc_id).first()
-
-            if not doc:
-                print(f"[worker] doc not found, skipping: {doc_id}")
-                continue
-
-            if doc.current_status != "pending":
-                print(
-                    f"[worker] doc not pending, skipping: {doc_id} status={doc.current_status}"
-                )
-                continue
-
-            # 1) pending -> processing
-            append_status(doc, "processing")
-            db.commit()
-            publish_status_event(doc)
-            print(f"[worker] set processing: {doc.id}")
-
-            # 2) Extract text
-            file_path = os.path.join(UPLOAD_DIR, doc.id, doc.filename)
-            ok, text_or_error = extract_text(file_path)
-            if not ok:
-                mark_failed(db, doc, text_or_error)
-                continue
-
-            doc.extracted_text = text_or_error
-            db.commit()
-            print(f"[worker] extracted text stored: {doc.id} chars={len(text_or_error)}")
-
-            # 3) processing -> analyzing
-            append_status(doc, "analyzing")
-            db.commit()
-            publish_status_event(doc)
-            print(f"[worker] set analyzing: {doc.id}")
-
-            # 4) LLM analysis with retry once
-            ok2, result_or_error = analyze_with_retry(doc.extracted_text)
-            if not ok2:
-                mark_failed(db, doc, str(result_or_error))
-                continue
-
-            doc.analysis_result = result_or_error
-
-            # 5) analyzing -> completed
-            append_status(doc, "completed")
-            db.commit()
-            publish_status_event(doc)
-            print(f"[worker] completed: {doc.id}")
+            with tracer.document(doc_id) as trace:
+                process_document(db, doc_id, trace)
 
         except Exception as e:
             db.rollback()
             print(f"[worker] unexpected error processing {doc_id}: {e}")
         finally:
-            db.close()
\ No newline at end of file
+            try:
+                tracer.flush(db, doc_id)
+            except Exception as e:
+                db.rollback()
+                print(f"[worker] could not store trace for {doc_id}: {e}")
+            db.close()
+
+
+def process_document(db: Session, doc_id: str, trace: dict):
+    doc = db.query(Document).filter(Document.id == doc_id).first()
+
+    if not doc:
+        trace["skipped"] = "not found"
+        print(f"[worker] doc not found, skipping: {doc_id}")
+        return
+
+    if doc.current_status != "pending":
+        trace["skipped"] = f"status={doc.current_status}"
+        print(
+            f"[worker] doc not pending, skipping: {doc_id} status={doc.current_status}"
+        )
+        return
+
+    # 1) pending -> processing
+    append_status(doc, "processing")
+    commit_traced(db, "processing")
+    publish_status_event(doc)
+    print(f"[worker] set processing: {doc.id}")
+
+    # 2) Extract text
+    file_path = os.path.join(UPLOAD_DIR, doc.id, doc.filename)
+    with tracer.span("extract", filename=doc.filename) as span:
+        ok, text_or_error, pages = extract_text(file_path)
+        if not ok:
+            span["error"] = text_or_error
+    if not ok:
+        mark_failed(db, doc, text_or_error)
+        return
+
+    # Original text is stored as-is; the LLM gets the normalized copy
+    with tracer.span("normalize") as span:
+        analysis_text, stats = normalize_for_analysis(pages)
+        span.update(tokens_before=stats["tokens_before"], tokens_after=stats["tokens_after"])
+    doc.extracted_text = text_or_error
+    doc.preprocess_stats = stats
+    commit_traced(db, "extracted")
+    print(
+        f"[worker] extracted text stored: {doc.id} chars={len(text_or_error)} "
+        f"tokens={stats['tokens_before']}->{stats['tokens_after']} "
+        f"reduction={stats['reduction_ratio']:.0%}"
+    )
+
+    # 3) processing -> analyzing
+    append_status(doc, "analyzing")
+    commit_traced(db, "analyzing")
+    publish_status_event(doc)
+    print(f"[worker] set analyzing: {doc.id}")
+
+    # 4) LLM analysis with retry once
+    with tracer.span("llm.analyze") as span:
+        ok2, result_or_error = analyze_with_retry(analysis_text)
+        if not ok2:
+            span["error"] = str(result_or_error)
+    if not ok2:
+        mark_failed(db, doc, str(result_or_error))
+        return
+
+    doc.analysis_result = result_or_error
+
+    # 5) analyzing -> completed
+    append_status(doc, "completed")
+    commit_traced(db, "completed")
+    publish_status_event(doc)
+    print(f"[worker] completed: {doc.id}")
@@ -0,0 +1,313 @@
+import gzip
+import os
+import shutil
+import time
+from datetime import datetime, timedelta
+from threading import Lock
+from typing import Any, Dict, List
+
+from sqlalchemy.orm import Session
+
+from app.config import (
+    LIFECYCLE_BATCH_PAUSE_SEC,
+    LIFECYCLE_BATCH_SIZE,
+    LIFECYCLE_INTERVAL_SEC,
+    RETAIN_COMPLETED_DAYS,
+    RETAIN_FAILED_DAYS,
+    UPLOAD_POLICY_AFTER_EXTRACTION,
+    VACUUM_PAGES_PER_RUN,
+)
+from app.database import engine
+from app.models.document import Document
+from app.models.trace_span import TraceSpan
+
+UPLOAD_DIR = "uploads"
+FINAL_STATUSES = ("completed", "failed")
+
+# One pass at a time: the background loop and POST /admin/storage/lifecycle
+# would otherwise pick the same rows and compress/delete the same files
+_pass_lock = Lock()
+
+
+class LifecycleBusy(Exception):
+    pass
+
+
+class LifecycleStats:
+    """
+    Thread-safe counters for the lifecycle manager (read by /admin/storage).
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._data: Dict[str, Any] = {
+            "runs": 0,
+            "last_run_at": None,
+            "last_run_sec": None,
+            "last_error": None,
+            "uploads_compressed": 0,
+            "uploads_deleted": 0,
+            "uploads_failed": 0,
+            "documents_expired": 0,
+            "reclaimed_bytes_uploads": 0,
+            "reclaimed_bytes_db": 0,
+        }
+
+    def add(self, **deltas: int) -> None:
+        with self._lock:
+            for key, value in deltas.items():
+                self._data[key] += value
+
+    def set(self, **values: Any) -> None:
+        with self._lock:
+            self._data.update(values)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._data)
+
+
+lifecycle_stats = LifecycleStats()
+
+
+def _dir_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def _compress_file(path: str) -> int:
+    """
+    gzip path -> path.gz, remove original. Returns bytes reclaimed.
+    On failure the partial .gz is removed and the original kept.
+    """
+    before = os.path.getsize(path)
+    gz_path = path + ".gz"
+    try:
+        with open(path, "rb") as src, gzip.open(gz_path, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(path)
+    except OSError:
+        if os.path.exists(gz_path):
+            os.remove(gz_path)
+        raise
+    return max(before - os.path.getsize(gz_path), 0)
+
+
+def compact_uploads(db_factory, policy: str = UPLOAD_POLICY_AFTER_EXTRACTION,
+                    batch_size: int = LIFECYCLE_BATCH_SIZE) -> int:
+    """
+    Compress or delete original uploads of finished documents whose text
+    was extracted. Processes bounded batches; returns bytes reclaimed.
+    Uploads that could not be compacted are marked "error" so the next
+    batch does not pick them up again; the original file is left in place.
+    """
+    if policy not in ("compress", "delete"):
+        return 0
+
+    reclaimed = 0
+    while True:
+        db: Session = db_factory()
+        try:
+            docs: List[Document] = (
+                db.query(Document)
+                .filter(
+                    Document.current_status.in_(FINAL_STATUSES),
+                    Document.extracted_text.isnot(None),
+                    Document.upload_state.is_(None),
+                )
+                .limit(batch_size)
+                .all()
+            )
+            if not docs:
+                break
+
+            for doc in docs:
+                path = os.path.join(UPLOAD_DIR, doc.id, doc.filename)
+                try:
+                    if os.path.exists(path):
+                        if policy == "compress":
+                            reclaimed += _compress_file(path)
+                            lifecycle_stats.add(uploads_compressed=1)
+                        else:
+                            size = os.path.getsize(path)
+                            os.remove(path)
+                            reclaimed += size
+                            lifecycle_stats.add(uploads_deleted=1)
+                except OSError as e:
+                    print(f"[lifecycle] could not compact {path}: {e}")
+                    lifecycle_stats.add(uploads_failed=1)
+                    doc.upload_state = "error"
+                    continue
+                doc.upload_state = "compressed" if policy == "compress" else "deleted"
+
+            db.commit()
+        finally:
+            db.close()
+
+        if len(docs) < batch_size:
+            break
+        time.sleep(LIFECYCLE_BATCH_PAUSE_SEC)
+
+    lifecycle_stats.add(reclaimed_bytes_uploads=reclaimed)
+    return reclaimed
+
+
+def expire_documents(db_factory, status: str, max_age_days: int,
+                     batch_size: int = LIFECYCLE_BATCH_SIZE) -> int:
+    """
+    Delete documents in a final status older than max_age_days, plus their
+    upload folders. Each batch is its own short transaction and batches are
+    separated by a pause, so the worker is never starved of the write lock.
+    Returns number of documents deleted.
+    """
+    if max_age_days <= 0 or status not in FINAL_STATUSES:
+        return 0
+
+    cutoff = datetime.utcnow() - timedelta(days=max_age_days)
+    deleted = 0
+    reclaimed = 0
+
+    while True:
+        db: Session = db_factory()
+        try:
+            ids = [
+                row[0]
+                for row in db.query(Document.id)
+                .filter(Document.current_status == status, Document.created_at < cutoff)
+                .limit(batch_size)
+                .all()
+            ]
+            if not ids:
+                break
+
+            db.query(TraceSpan).filter(TraceSpan.document_id.in_(ids)).delete(synchronize_session=False)
+            db.query(Document).filter(Document.id.in_(ids)).delete(synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+        # Files go after the rows are gone, outside the transaction
+        for doc_id in ids:
+            folder = os.path.join(UPLOAD_DIR, doc_id)
+            if os.path.exists(folder):
+                reclaimed += _dir_size(folder)
+                shutil.rmtree(folder, ignore_errors=True)
+
+        deleted += len(ids)
+        if len(ids) < batch_size:
+            break
+        time.sleep(LIFECYCLE_BATCH_PAUSE_SEC)
+
+    lifecycle_stats.add(documents_expired=deleted, reclaimed_bytes_uploads=reclaimed)
+    return deleted
+
+
+def incremental_vacuum(max_pages: int = VACUUM_PAGES_PER_RUN, pages_per_txn: int = 200) -> int:
+    """
+    Return up to max_pages free pages to the OS, pages_per_txn at a time so
+    the write lock is only held briefly. Requires auto_vacuum=INCREMENTAL
+    (set by init_db). Returns bytes reclaimed.
+
+    Note: the sqlite3 driver steps a statement only once, and each step of
+    PRAGMA incremental_vacuum frees a single page, so we issue one
+    incremental_vacuum(1) per page inside an explicit transaction.
+    """
+    if max_pages <= 0:
+        return 0
+
+    raw = engine.raw_connection()
+    try:
+        cur = raw.cursor()
+        page_size = cur.execute("PRAGMA page_size").fetchone()[0]
+        before = cur.execute("PRAGMA freelist_count").fetchone()[0]
+
+        remaining = min(max_pages, before)
+        while remaining > 0:
+            n = min(pages_per_txn, remaining)
+            cur.execute("BEGIN IMMEDIATE")
+            for _ in range(n):
+                cur.execute("PRAGMA incremental_vacuum(1)")
+            cur.close()  # reset the in-progress pragma so COMMIT is allowed
+            raw.commit()
+            cur = raw.cursor()
+            remaining -= n
+            if remaining > 0:
+                time.sleep(LIFECYCLE_BATCH_PAUSE_SEC)
+
+        after = cur.execute("PRAGMA freelist_count").fetchone()[0]
+        cur.close()
+    finally:
+        raw.close()
+
+    reclaimed = max(before - after, 0) * page_size
+    lifecycle_stats.add(reclaimed_bytes_db=reclaimed)
+    return reclaimed
+
+
+def run_lifecycle_once(db_factory) -> Dict[str, int]:
+    """
+    One full lifecycle pass. Raises LifecycleBusy if another pass is running.
+    """
+    if not _pass_lock.acquire(blocking=False):
+        raise LifecycleBusy("A lifecycle pass is already running")
+
+    try:
+        started = time.perf_counter()
+        result = {
+            "upload_bytes_reclaimed": compact_uploads(db_factory),
+            "completed_expired": expire_documents(db_factory, "completed", RETAIN_COMPLETED_DAYS),
+            "failed_expired": expire_documents(db_factory, "failed", RETAIN_FAILED_DAYS),
+            "db_bytes_reclaimed": incremental_vacuum(),
+        }
+    finally:
+        _pass_lock.release()
+
+    lifecycle_stats.add(runs=1)
+    lifecycle_stats.set(
+        last_run_at=datetime.utcnow().isoformat(),
+        last_run_sec=round(time.perf_counter() - started, 3),
+        last_error=None,
+    )
+    return result
+
+
+def storage_report() -> Dict[str, Any]:
+    """Current disk usage plus cumulative lifecycle counters."""
+    with engine.connect() as conn:
+        page_size = conn.exec_driver_sql("PRAGMA page_size").scalar()
+        page_count = conn.exec_driver_sql("PRAGMA page_count").scalar()
+        freelist = conn.exec_driver_sql("PRAGMA freelist_count").scalar()
+
+    return {
+        "uploads_bytes": _dir_size(UPLOAD_DIR),
+        "db_bytes": page_size * page_count,
+        "db_free_bytes": page_size * freelist,
+        "policy": {
+            "upload_after_extraction": UPLOAD_POLICY_AFTER_EXTRACTION,
+            "retain_completed_days": RETAIN_COMPLETED_DAYS,
+            "retain_failed_days": RETAIN_FAILED_DAYS,
+            "vacuum_pages_per_run": VACUUM_PAGES_PER_RUN,
+        },
+        "lifecycle": lifecycle_stats.snapshot(),
+    }
+
+
+def lifecycle_loop(db_factory, interval: float = LIFECYCLE_INTERVAL_SEC):
+    print("[lifecycle] started")
+
+    while True:
+        try:
+            result = run_lifecycle_once(db_factory)
+            print(f"[lifecycle] run complete: {result}")
+        except LifecycleBusy:
+            print("[lifecycle] pass already running, skipping this interval")
+        except Exception as e:
+            lifecycle_stats.set(last_error=str(e))
+            print(f"[lifecycle] run failed: {e}")
+        time.sleep(interval)
@@ -0,0 +1,111 @@
+"""
+Cold-start benchmark for the API process.
+
+Measures, each in a fresh interpreter:
+- import time of `app.main`
+- time to first request (import + startup hooks + login + GET /documents)
+
+Also checks that heavy, lazily-imported modules are NOT loaded by `import app.main`.
+Exits non-zero if a budget is exceeded, so it can gate CI.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5] [--import-budget-ms 1500] [--ttfr-budget-ms 2500]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LAZY_MODULES = ["openai", "pypdf", "jose", "tiktoken"]
+
+IMPORT_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - t0
+print(json.dumps({
+    "import_ms": elapsed * 1000,
+    "loaded": [m for m in %(lazy)r if m in sys.modules],
+}))
+"""
+
+FIRST_REQUEST_PROBE = """
+import json, time
+t0 = time.perf_counter()
+from fastapi.testclient import TestClient
+import app.main
+with TestClient(app.main.app) as client:
+    r = client.post("/auth/login", json={"username": "admin", "password": "password123"})
+    assert r.status_code == 200, r.text
+    token = r.json()["access_token"]
+    # DB-backed route: fails if the schema step did not create tables
+    r = client.get("/documents", headers={"Authorization": "Bearer " + token})
+    elapsed = time.perf_counter() - t0
+    assert r.status_code == 200, r.text
+print(json.dumps({"ttfr_ms": elapsed * 1000}))
+"""
+
+
+def _run_probe(code: str, cwd: str) -> dict:
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT, PYTHONDONTWRITEBYTECODE="1")
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # Last line is the JSON result (startup prints come first)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-budget-ms", type=float, default=1500)
+    parser.add_argument("--ttfr-budget-ms", type=float, default=2500)
+    args = parser.parse_args()
+
+    # Run in a scratch dir so documents.db / uploads/ land there
+    with tempfile.TemporaryDirectory() as cwd:
+        subprocess.run(
+            [sys.executable, "-m", "app.database"],
+            cwd=cwd,
+            env=dict(os.environ, PYTHONPATH=REPO_ROOT),
+            capture_output=True,
+            check=True,
+        )
+
+        import_runs = [_run_probe(IMPORT_PROBE % {"lazy": LAZY_MODULES}, cwd) for _ in range(args.runs)]
+        ttfr_runs = [_run_probe(FIRST_REQUEST_PROBE, cwd) for _ in range(args.runs)]
+
+    import_ms = statistics.median(r["import_ms"] for r in import_runs)
+    ttfr_ms = statistics.median(r["ttfr_ms"] for r in ttfr_runs)
+    loaded = sorted({m for r in import_runs for m in r["loaded"]})
+
+    print(f"import app.main        : {import_ms:8.1f} ms (median of {args.runs}, budget {args.import_budget_ms:.0f})")
+    print(f"time to first request  : {ttfr_ms:8.1f} ms (median of {args.runs}, budget {args.ttfr_budget_ms:.0f})")
+    print(f"eager heavy modules    : {', '.join(loaded) or 'none'}")
+
+    failed = False
+    if loaded:
+        print(f"FAIL: modules expected to be lazy were imported eagerly: {loaded}")
+        failed = True
+    if import_ms > args.import_budget_ms:
+        print("FAIL: import time over budget")
+        failed = True
+    if ttfr_ms > args.ttfr_budget_ms:
+        print("FAIL: time to first request over budget")
+        failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
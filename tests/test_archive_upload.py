@@ -0,0 +1,188 @@
+import io
+import os
+import tarfile
+import zipfile
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.auth.jwt_handler import verify_token
+from app.models.document import Document
+from app.queue.fifo_queue import FIFOQueue
+from app.routes import documents
+from app.services.archive_ingest import MemberTooLarge, copy_member
+from app.tracing.tracer import Tracer
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    q = FIFOQueue()
+    monkeypatch.setattr(documents, "document_queue", q)
+    return q
+
+
+@pytest.fixture
+def client(session_factory, queue, tmp_path, monkeypatch):
+    monkeypatch.setattr(documents, "UPLOAD_DIR", str(tmp_path / "uploads"))
+    monkeypatch.setattr(documents, "MAX_FILE_SIZE", 100)
+    monkeypatch.setattr(documents, "tracer", Tracer(enabled=False))
+
+    def get_test_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(documents.router)
+    app.dependency_overrides[documents.get_db] = get_test_db
+    app.dependency_overrides[verify_token] = lambda: {"sub": "test"}
+    return TestClient(app)
+
+
+def _zip(members, compression=zipfile.ZIP_STORED):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", compression=compression) as zf:
+        for name, data in members:
+            zf.writestr(name, data)
+    return buf.getvalue()
+
+
+def _tar_gz(members):
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w:gz") as tf:
+        for name, data in members:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tf.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
+
+
+def _upload(client, payload, name="batch.zip"):
+    return client.post("/documents/upload/archive", files={"file": (name, payload)})
+
+
+def _skipped(resp):
+    return {s["filename"]: s["reason"] for s in resp.json()["skipped"]}
+
+
+def _uploaded_files(tmp_path):
+    root = tmp_path / "uploads"
+    return sorted(p.relative_to(root).parts[1] for p in root.rglob("*") if p.is_file())
+
+
+def test_zip_members_become_documents(client, queue, session_factory, tmp_path):
+    resp = _upload(client, _zip([("a.txt", b"alpha"), ("docs/b.pdf", b"%PDF-1.4")]))
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["accepted"] == 2
+    assert body["skipped"] == []
+
+    db = session_factory()
+    docs = db.query(Document).filter(Document.batch_id == body["batch_id"]).all()
+    assert sorted(d.filename for d in docs) == ["a.txt", "b.pdf"]
+    assert len(queue.snapshot()) == 2
+    assert _uploaded_files(tmp_path) == ["a.txt", "b.pdf"]
+
+    progress = client.get(f"/documents/batches/{body['batch_id']}").json()
+    assert progress["total"] == 2
+    assert progress["status_counts"] == {"pending": 2}
+    assert progress["done"] is False
+
+
+def test_tar_gz_is_streamed(client):
+    resp = _upload(client, _tar_gz([("x/one.txt", b"1"), ("two.txt", b"2")]), name="batch.tgz")
+
+    assert resp.status_code == 200
+    assert resp.json()["accepted"] == 2
+
+
+def test_bad_extension_and_too_large_are_skipped(client, tmp_path):
+    resp = _upload(client, _zip([("ok.txt", b"fine"), ("img.png", b"png"), ("big.txt", b"x" * 500)]))
+
+    assert resp.status_code == 200
+    assert resp.json()["accepted"] == 1
+    skipped = _skipped(resp)
+    assert "Invalid file type" in skipped["img.png"]
+    assert "too large" in skipped["big.txt"]
+    assert _uploaded_files(tmp_path) == ["ok.txt"]
+
+
+def test_copy_member_enforces_size_on_bytes_read(tmp_path):
+    # Declared sizes can lie; the limit applies to what is actually read
+    dest = tmp_path / "big.txt"
+
+    with pytest.raises(MemberTooLarge):
+        copy_member(io.BytesIO(b"y" * 500), str(dest), max_size=100)
+
+    assert not dest.exists()
+    assert copy_member(io.BytesIO(b"y" * 100), str(dest), max_size=100) == 100
+
+
+def test_path_traversal_names_stay_inside_upload_dir(client, tmp_path):
+    resp = _upload(client, _zip([("../../evil.txt", b"x"), ("..", b"y")]))
+
+    assert resp.json()["accepted"] == 1
+    assert not (tmp_path / "evil.txt").exists()
+    assert _uploaded_files(tmp_path) == ["evil.txt"]
+    assert ".." in _skipped(resp)
+
+
+def test_corrupt_member_is_skipped_not_fatal(client, tmp_path):
+    payload = bytearray(_zip([("good.txt", b"good content"), ("bad.txt", b"corrupt me please")]))
+    i = payload.index(b"corrupt me please")
+    payload[i] ^= 0xFF  # CRC mismatch on read
+
+    resp = _upload(client, bytes(payload))
+
+    assert resp.status_code == 200
+    assert resp.json()["accepted"] == 1
+    assert "Unreadable member" in _skipped(resp)["bad.txt"]
+    assert _uploaded_files(tmp_path) == ["good.txt"]
+
+
+def test_bad_deflate_stream_is_skipped(client):
+    payload = bytearray(_zip([("good.txt", b"ok"), ("bad.txt", b"z" * 80)], zipfile.ZIP_DEFLATED))
+    # Damage the compressed data of the second member
+    header = payload.index(b"PK\x03\x04", 1)
+    data_start = header + 30 + len(b"bad.txt")
+    payload[data_start] = 0xFF
+    payload[data_start + 1] = 0xFF
+
+    resp = _upload(client, bytes(payload))
+
+    assert resp.status_code == 200
+    assert resp.json()["accepted"] == 1
+    assert "bad.txt" in _skipped(resp)
+
+
+def test_encrypted_member_is_skipped(client):
+    payload = bytearray(_zip([("good.txt", b"ok"), ("secret.txt", b"hidden")]))
+    # Set the "encrypted" flag on the second central directory entry
+    first = payload.index(b"PK\x01\x02")
+    second = payload.index(b"PK\x01\x02", first + 1)
+    payload[second + 8] |= 0x01
+
+    resp = _upload(client, bytes(payload))
+
+    assert resp.status_code == 200
+    assert resp.json()["accepted"] == 1
+    assert "encrypted" in _skipped(resp)["secret.txt"]
+
+
+def test_non_archive_is_rejected(client, queue, tmp_path):
+    resp = _upload(client, b"just some bytes, not an archive", name="notes.txt")
+
+    assert resp.status_code == 400
+    assert "Unsupported archive" in resp.json()["detail"]
+    assert queue.size() == 0
+
+
+def test_archive_without_valid_members_is_rejected(client, tmp_path):
+    resp = _upload(client, _zip([("img.png", b"png")]))
+
+    assert resp.status_code == 400
+    assert not os.path.exists(tmp_path / "uploads") or _uploaded_files(tmp_path) == []
@@ -0,0 +1,49 @@
+import os
+
+from app.models.document import Document
+from app.workers import lifecycle_worker
+from app.workers.lifecycle_worker import compact_uploads
+
+
+def _add_upload(db, upload_dir, document_id, content=b"x" * 4096):
+    folder = upload_dir / document_id
+    folder.mkdir()
+    (folder / "a.txt").write_bytes(content)
+    db.add(Document(
+        id=document_id,
+        filename="a.txt",
+        current_status="completed",
+        status_history=[],
+        extracted_text="text",
+    ))
+    db.commit()
+    return folder / "a.txt"
+
+
+def test_failed_compression_keeps_original_and_marks_error(db, session_factory, tmp_path, monkeypatch):
+    monkeypatch.setattr(lifecycle_worker, "UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr(lifecycle_worker, "LIFECYCLE_BATCH_PAUSE_SEC", 0)
+    bad = _add_upload(db, tmp_path, "bad")
+    good = _add_upload(db, tmp_path, "good")
+
+    real_copy = lifecycle_worker.shutil.copyfileobj
+
+    def copy_or_fail(src, dst):
+        if src.name == str(bad):
+            dst.write(b"partial")
+            raise OSError("disk full")
+        real_copy(src, dst)
+
+    monkeypatch.setattr(lifecycle_worker.shutil, "copyfileobj", copy_or_fail)
+
+    reclaimed = compact_uploads(session_factory, policy="compress", batch_size=1)
+
+    assert reclaimed > 0
+    assert bad.exists()
+    assert not os.path.exists(str(bad) + ".gz")
+    assert not good.exists()
+    assert os.path.exists(str(good) + ".gz")
+
+    db.expire_all()
+    assert db.get(Document, "bad").upload_state == "error"
+    assert db.get(Document, "good").upload_state == "compressed"
@@ -0,0 +1,47 @@
+from datetime import datetime, timedelta
+
+from app.models.document import Document
+from app.queue.fifo_queue import FIFOQueue
+from app.services import queue_bootstrap
+from app.services.queue_bootstrap import rebuild_queue_from_db
+
+
+def test_ids_enqueued_during_restore_go_behind_restored_ids():
+    q = FIFOQueue()
+    q.begin_restore()
+
+    q.enqueue("new-1")
+    q.restore_many(["old-1", "old-2"])
+    q.enqueue_many(["new-2", "old-1"])
+    q.restore_many(["old-3", "new-1"])
+
+    assert q.dequeue() == "old-1"
+    assert q.size() == 4
+
+    q.end_restore()
+    q.enqueue("new-3")
+
+    assert [q.dequeue() for _ in range(5)] == ["old-2", "old-3", "new-1", "new-2", "new-3"]
+    assert q.dequeue() is None
+
+
+def test_rebuild_requeues_pending_in_created_order(db, session_factory, monkeypatch):
+    q = FIFOQueue()
+    monkeypatch.setattr(queue_bootstrap, "document_queue", q)
+    start = datetime(2024, 1, 1)
+    for i, status in enumerate(["pending", "completed", "pending", "pending"]):
+        db.add(Document(
+            id=f"doc-{3 - i}",
+            filename="a.txt",
+            current_status=status,
+            status_history=[],
+            created_at=start + timedelta(minutes=i),
+        ))
+    db.commit()
+
+    q.begin_restore()
+    q.enqueue("uploaded-during-rebuild")
+    assert rebuild_queue_from_db(session_factory, batch_size=2) == 3
+    q.end_restore()
+
+    assert q.snapshot() == ["doc-3", "doc-1", "doc-0", "uploaded-during-rebuild"]
@@ -0,0 +1,33 @@
+from app.services import text_extractor
+from app.services.text_extractor import extract_text
+
+
+def test_pdf_text_is_stored_without_page_markers(tmp_path, monkeypatch):
+    pdf = tmp_path / "report.pdf"
+    pdf.write_bytes(b"%PDF-1.4")
+    monkeypatch.setattr(
+        text_extractor, "extract_pages_from_pdf", lambda path: ["Page one\n", "Page two"]
+    )
+
+    ok, text, pages = extract_text(str(pdf))
+
+    assert ok is True
+    assert text == "Page one\n\nPage two"
+    assert "\f" not in text
+    assert pages == ["Page one\n", "Page two"]
+
+
+def test_txt_is_a_single_page(tmp_path):
+    txt = tmp_path / "notes.txt"
+    txt.write_text("line 1\nline 2", encoding="utf-8")
+
+    assert extract_text(str(txt)) == (True, "line 1\nline 2", ["line 1\nline 2"])
+
+
+def test_failure_has_no_pages(tmp_path):
+    ok, _, pages = extract_text(str(tmp_path / "missing.txt"))
+    assert (ok, pages) == (False, [])
+
+    empty = tmp_path / "empty.txt"
+    empty.write_text("  \n", encoding="utf-8")
+    assert extract_text(str(empty)) == (False, "No text could be extracted (empty result)", [])
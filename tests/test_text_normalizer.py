@@ -0,0 +1,169 @@
+import threading
+import time
+
+import pytest
+
+from app.services import text_normalizer
+from app.services.text_normalizer import normalize_for_analysis
+
+
+_real_get_encoder = text_normalizer._get_encoder
+
+
+@pytest.fixture(autouse=True)
+def approx_tokenizer(monkeypatch):
+    # Deterministic and offline: never touch tiktoken in tests
+    monkeypatch.setattr(text_normalizer, "_get_encoder", lambda: None)
+
+
+def _pdf(pages):
+    return ["\n".join(lines) for lines in pages]
+
+
+def _report():
+    figures = [
+        ("North", "$1500", "42%", "2024", "(12)"),
+        ("South", "$2750", "17%", "2023", "(3)"),
+        ("East", "$980", "8%", "2022", "(45)"),
+        ("West", "$3100", "61%", "2021", "(7)"),
+    ]
+    pages = []
+    for n, (region, revenue, growth, year, count) in enumerate(figures, start=1):
+        pages.append([
+            "ACME Corp Confidential",
+            f"Quarterly report {region}",
+            "Revenue for the region",
+            revenue,
+            "Growth",
+            growth,
+            "Fiscal year",
+            year,
+            "Open issues",
+            count,
+            "1.",
+            f"The {region} team expanded distribution this quarter.",
+            "This report is provided for internal use only and must not be shared.",
+            f"Page {n} of 4",
+        ])
+    return _pdf(pages)
+
+
+def test_repeated_header_footer_and_boilerplate_removed():
+    out, stats = normalize_for_analysis(_report())
+
+    assert "ACME Corp Confidential" not in out
+    assert "Page 1 of 4" not in out
+    assert "must not be shared" not in out
+    assert stats["removed_lines"] == 12  # header + boilerplate + page number, 4 pages
+    assert stats["repeated_lines"]["edge:acme corp confidential"] == 4
+
+
+def test_figures_and_labels_survive():
+    out, _ = normalize_for_analysis(_report())
+
+    for value in ("$1500", "$2750", "42%", "61%", "2024", "2021", "(12)", "(45)", "1."):
+        assert value in out
+    assert out.count("Revenue for the region") == 4
+    assert out.count("Growth") == 4
+
+
+def test_page_number_rule_only_at_page_edges():
+    pages = [
+        [f"Heading {n}", "Intro text", "- 7 -", "Page 3", "more body", f"body {n}", f"- {n} -"]
+        for n in range(1, 5)
+    ]
+    out, _ = normalize_for_analysis(_pdf(pages))
+
+    # interior lines that look like page numbers are content
+    assert out.count("- 7 -") == 4
+    assert out.count("Page 3") == 4
+    # the real footer goes
+    assert "- 2 -" not in out
+
+
+@pytest.mark.parametrize("line", ["Page 3", "page 3 of 12", "p. 3", "3 of 12", "3/12", "- 3 -", "– 3 –"])
+def test_page_number_forms(line):
+    assert text_normalizer._PAGE_NUMBER_LINE.match(line)
+
+
+@pytest.mark.parametrize("line", ["$1500", "42%", "2024", "(12)", "1.", "12"])
+def test_figures_are_not_page_numbers(line):
+    assert not text_normalizer._PAGE_NUMBER_LINE.match(line)
+
+
+def test_single_character_edge_lines_do_not_leak_to_interior():
+    # "a" is interned by CPython; edge marking must use positions, not id()
+    pages = [["a", "x", "a", "y", "z", "w", "v", "a"] for _ in range(4)]
+    out, _ = normalize_for_analysis(_pdf(pages))
+
+    assert out.count("a") == 4  # the interior "a" on each page stays
+
+
+def test_everything_stripped_falls_back_to_normalized_text():
+    pages = [["Same   header", "Same footer"] for _ in range(4)]
+    out, stats = normalize_for_analysis(_pdf(pages))
+
+    assert stats["removed_lines"] == 8
+    assert out.count("Same header") == 4
+    assert "   " not in out
+
+
+def test_whitespace_and_hyphenation():
+    out, _ = normalize_for_analysis(["An exam-\nple   with\t\tspaces\n\n\n\nand gaps"])
+
+    assert out == "An example with spaces\n\nand gaps"
+
+
+def test_token_budget_and_stats():
+    text = " ".join(f"w{i}" for i in range(100))
+    out, stats = normalize_for_analysis([text], token_budget=10)
+
+    assert out == " ".join(f"w{i}" for i in range(10))
+    assert stats["tokens_before"] == 100
+    assert stats["tokens_after"] == 10
+    assert stats["truncated"] is True
+    assert stats["reduction_ratio"] == 0.9
+    assert stats["tokenizer"] == "approx"
+
+
+def test_slow_tokenizer_load_does_not_block(monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(text_normalizer, "_get_encoder", _real_get_encoder)
+    monkeypatch.setattr(text_normalizer, "_encoder", None)
+    monkeypatch.setattr(text_normalizer, "_encoder_state", "idle")
+    monkeypatch.setattr(text_normalizer, "_load_encoder", lambda: release.wait(10))
+
+    started = time.perf_counter()
+    _, stats = normalize_for_analysis(["some text to analyze"])
+    release.set()
+
+    assert time.perf_counter() - started < 1
+    assert stats["tokenizer"] == "approx"
+    assert text_normalizer._encoder_state == "loading"
+
+
+@pytest.mark.parametrize("budget", [0, -5])
+def test_non_positive_budget_sends_nothing(budget):
+    out, stats = normalize_for_analysis(["a b c d e f"], token_budget=budget)
+
+    assert out == ""
+    assert stats["tokens_after"] == 0
+
+
+def test_non_positive_budget_with_tiktoken_branch():
+    class FakeEncoder:
+        def encode(self, text, disallowed_special=()):
+            return list(range(len(text.split())))
+
+        def decode(self, tokens):
+            raise AssertionError("nothing should be decoded")
+
+    assert text_normalizer._truncate("a b c", 0, FakeEncoder()) == ("", 0)
+
+
+def test_approx_tokens_split_long_words():
+    assert text_normalizer.count_tokens("abcdefghij, ok") == 5
+
+    assert text_normalizer.truncate_to_tokens("abcdefghij, ok", 2) == ("abcdefgh", 2)
+    assert text_normalizer.truncate_to_tokens("abcdefghij, ok", 5) == ("abcdefghij, ok", 5)
+    assert text_normalizer.truncate_to_tokens("abcdefghij, ok", 9) == ("abcdefghij, ok", 5)
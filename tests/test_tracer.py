@@ -0,0 +1,48 @@
+from app.models.document import Document
+from app.models.trace_span import TraceSpan
+from app.tracing.tracer import Tracer
+
+
+def _add_document(db, document_id):
+    db.add(Document(id=document_id, filename="a.txt", status_history=[]))
+    db.commit()
+
+
+def test_flush_persists_spans_with_queue_wait(db):
+    tracer = Tracer(enabled=True, export_path="")
+    _add_document(db, "doc-1")
+
+    tracer.record_enqueue(["doc-1"])
+    with tracer.document("doc-1"):
+        with tracer.span("extract"):
+            pass
+
+    assert tracer.flush(db, "doc-1") == 3
+    spans = {s.name: s for s in db.query(TraceSpan).all()}
+    assert set(spans) == {"enqueue", "process", "extract"}
+    assert "queue_wait_ms" in spans["process"].attributes
+    assert spans["extract"].parent_span_id == spans["process"].span_id
+
+
+def test_flush_drops_spans_of_deleted_document(db):
+    tracer = Tracer(enabled=True, export_path="")
+
+    # Uploaded, then deleted while still pending: the worker finds no row
+    tracer.record_enqueue(["gone"])
+    with tracer.document("gone"):
+        pass
+
+    assert tracer.flush(db, "gone") == 0
+    assert db.query(TraceSpan).count() == 0
+    assert "gone" not in tracer._buffers
+    assert "gone" not in tracer._enqueued_at
+
+
+def test_discard_clears_buffer():
+    tracer = Tracer(enabled=True, export_path="")
+    tracer.record_enqueue(["doc-1"])
+
+    tracer.discard("doc-1")
+
+    assert tracer._buffers == {}
+    assert tracer._enqueued_at == {}